@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 from main import run_agent
+from database_manager import create_table
+from query_parser import compile_query, compile_task_search, is_recognised_filter
 
 load_dotenv()
 
@@ -17,21 +19,10 @@ def get_db_connection():
     return conn
 
 def get_deadlines(filter_query=""):
+    """Runs the chat filter (see query_parser.compile_query) and returns the matching rows."""
+    query, params = compile_query(filter_query)
     conn = get_db_connection()
-    query = "SELECT id, task_name, course_name, due_date, status FROM deadlines"
-    
-    if "latest" in filter_query:
-        query += " WHERE status = 'pending' ORDER BY due_date ASC"
-    elif "quiz" in filter_query:
-        query += " WHERE status = 'pending' AND (task_name LIKE '%quiz%' OR course_name LIKE '%quiz%') ORDER BY due_date ASC"
-    elif "assignment" in filter_query:
-        query += " WHERE status = 'pending' AND (task_name LIKE '%assignment%' OR task_name LIKE '%p-set%') ORDER BY due_date ASC"
-    elif "done" in filter_query:
-        query += " WHERE status = 'done' ORDER BY due_date DESC"
-    else:
-        query += " WHERE status = 'pending' ORDER BY due_date ASC"
-        
-    df = pd.read_sql_query(query, conn, parse_dates=["due_date"])
+    df = pd.read_sql_query(query, conn, params=params, parse_dates=["due_date"])
     conn.close()
     return df
 
@@ -63,13 +54,10 @@ def delete_deadline(deadline_id):
 
 # --- NEW FUNCTION ---
 def get_tasks_to_delete(search_term: str):
-    """Gets a list of pending tasks that match a search term."""
+    """Gets a list of tasks (pending unless the search says otherwise) that match a search term."""
+    query, params = compile_task_search(search_term, columns=("id", "task_name", "course_name", "due_date"))
     conn = get_db_connection()
-    # Use LIKE to find partial matches
-    tasks = conn.execute(
-        "SELECT id, task_name, course_name, due_date FROM deadlines WHERE status = 'pending' AND task_name LIKE ?",
-        (f"%{search_term}%",)
-    ).fetchall()
+    tasks = conn.execute(query, params).fetchall()
     conn.close()
     return tasks
 
@@ -87,6 +75,9 @@ if "delete_mode" not in st.session_state:
     st.session_state.delete_mode = False # Are we in "view" or "delete" mode?
 if "tasks_to_delete" not in st.session_state:
     st.session_state.tasks_to_delete = [] # List of tasks matching delete command
+if "db_ready" not in st.session_state:
+    create_table() # Makes sure the indexes used by the chat filters exist
+    st.session_state.db_ready = True
 
 # --- 1. Dashboard ---
 st.header("Dashboard")
@@ -131,7 +122,9 @@ if st.button("Scan Emails Now"):
 # --- 3. Chat Interface ---
 st.header("💬 Chat Interface")
 st.write("Ask the agent to filter or delete. Try these commands:")
-st.info("`latest` | `quiz` | `assignment` | `delete [task name]`")
+st.info("`latest` | `quiz` | `assignment` | `done` | `delete [task name]`")
+st.caption("Filters can be combined, e.g. `course:CS410 due<7d status:pending quiz`. "
+           "Use `status:done` or `status:all`, `due<=2w` or `due:2025-11-05`, and quotes for phrases like `task:\"Homework 3\"`.")
 
 prompt = st.chat_input("What do you want to see?")
 
@@ -148,13 +141,18 @@ if prompt:
             st.session_state.messages.append({"role": "assistant", "content": "Please specify what you want to delete. (e.g., `delete Quiz 1`)"})
             st.session_state.delete_mode = False
         else:
-            st.session_state.tasks_to_delete = get_tasks_to_delete(search_term)
-            
-            if not st.session_state.tasks_to_delete:
-                st.session_state.messages.append({"role": "assistant", "content": f"Sorry, I couldn't find any pending tasks matching '{search_term}'."})
-                st.session_state.delete_mode = False # Exit delete mode
+            try:
+                st.session_state.tasks_to_delete = get_tasks_to_delete(search_term)
+            except ValueError as e:
+                st.session_state.tasks_to_delete = []
+                st.session_state.messages.append({"role": "assistant", "content": f"Sorry, I couldn't understand that search: {e}"})
+                st.session_state.delete_mode = False
             else:
-                st.session_state.messages.append({"role": "assistant", "content": f"I found {len(st.session_state.tasks_to_delete)} task(s) matching '{search_term}'. Please confirm below."})
+                if not st.session_state.tasks_to_delete:
+                    st.session_state.messages.append({"role": "assistant", "content": f"Sorry, I couldn't find any tasks matching '{search_term}'."})
+                    st.session_state.delete_mode = False # Exit delete mode
+                else:
+                    st.session_state.messages.append({"role": "assistant", "content": f"I found {len(st.session_state.tasks_to_delete)} task(s) matching '{search_term}'. Please confirm below."})
         
         st.rerun() # Rerun to show the new UI state
 
@@ -162,7 +160,10 @@ if prompt:
         # This is the old "filter" logic
         st.session_state.delete_mode = False # Ensure we are in view mode
         st.session_state.filter = prompt_lower
-        st.session_state.messages.append({"role": "assistant", "content": f"OK, filtering for: '{st.session_state.filter}'"})
+        if is_recognised_filter(prompt_lower):
+            st.session_state.messages.append({"role": "assistant", "content": f"OK, filtering for: '{st.session_state.filter}'"})
+        else:
+            st.session_state.messages.append({"role": "assistant", "content": f"I didn't recognise a filter in '{prompt}', so I'm showing all pending tasks. Try `quiz`, `done` or `course:CS410 due<7d`."})
         st.rerun() # Rerun to apply the filter
 
 # --- 4. Main Display (Conditional UI) ---
@@ -230,6 +231,8 @@ else:
                             st.success(f"Updated Task ID {deadline_id} to '{new_status}'!")
                             st.rerun()
 
+    except ValueError as e:
+        st.error(f"Couldn't understand that filter: {e}")
     except Exception as e:
         st.error(f"Failed to load data from database: {e}")
         st.info("Database not found. Click 'Scan Emails Now' to initialize it.")
\ No newline at end of file
@@ -0,0 +1,187 @@
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from database_manager import create_table, get_change_state, get_deadlines_changed_since, get_deadline_ids
+
+FEED_HOST = "127.0.0.1"
+FEED_PORT = 8765
+FEED_PATH = "/deadlines.ics"
+UID_DOMAIN = "deadlineai.local"
+
+
+def _escape(text: str) -> str:
+    """Escapes a value for an iCalendar TEXT property (RFC 5545 3.3.11)."""
+    # Bare CRs would break the CRLF line structure, so every line break becomes \n
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return (text.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Folds a content line so no physical line is longer than 75 octets."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split in the middle of a multi-byte UTF-8 character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts)
+
+
+def render_vevent(row) -> str:
+    """
+    Renders one deadline row as an all-day VEVENT block.
+    Everything comes from the row itself, so the same database state always
+    renders to the same bytes (which the strong ETag relies on).
+    """
+    dtstamp = datetime.fromtimestamp(row["updated_at"], tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    due = date.fromisoformat(row["due_date"][:10])
+    summary = row["task_name"]
+    if row["course_name"]:
+        summary += f" ({row['course_name']})"
+    if row["status"] == "done":
+        summary = f"[Done] {summary}"
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:deadline-{row['id']}@{UID_DOMAIN}",
+        f"DTSTAMP:{dtstamp}",
+        f"SEQUENCE:{row['mod_seq']}",
+        f"DTSTART;VALUE=DATE:{due.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(due + timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{_escape(summary)}",
+        "TRANSP:TRANSPARENT",
+        "END:VEVENT",
+    ]
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+class CalendarFeed:
+    """
+    Cached .ics rendering of the deadlines table.
+    Each refresh reads only the table-wide change counter; when it has moved,
+    only rows with a newer mod_seq are re-rendered and deleted rows are dropped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: Dict[int, str] = {}
+        self._seen_seq = -1
+        self._body = b""
+        self._etag = ""
+        self._last_modified = 0
+
+    def get(self) -> Tuple[bytes, str, int]:
+        """Returns (body, etag, last_modified) for the current state of the database."""
+        with self._lock:
+            change_seq, modified_at = get_change_state()
+            if change_seq != self._seen_seq:
+                self._refresh(change_seq, modified_at)
+            return self._body, self._etag, self._last_modified
+
+    def _refresh(self, change_seq: int, modified_at: int):
+        for row in get_deadlines_changed_since(self._seen_seq):
+            # Edits committed after change_seq was read are left for the next refresh
+            if row["mod_seq"] > change_seq:
+                continue
+            self._events[row["id"]] = render_vevent(row)
+
+        live_ids = get_deadline_ids()
+        for deadline_id in list(self._events):
+            if deadline_id not in live_ids:
+                del self._events[deadline_id]
+
+        body = (
+            "BEGIN:VCALENDAR\r\n"
+            "VERSION:2.0\r\n"
+            "PRODID:-//DeadlineAI//Deadline Feed//EN\r\n"
+            "CALSCALE:GREGORIAN\r\n"
+            "X-WR-CALNAME:Deadlines\r\n"
+            + "".join(self._events[k] for k in sorted(self._events))
+            + "END:VCALENDAR\r\n"
+        )
+        self._body = body.encode("utf-8")
+        self._etag = f'"{change_seq}-{modified_at}"'
+        self._last_modified = modified_at
+        self._seen_seq = change_seq
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    """Serves the feed at FEED_PATH and answers conditional GETs with 304."""
+
+    feed = CalendarFeed()
+
+    def do_GET(self):
+        if self.path.split("?")[0] != FEED_PATH:
+            self.send_error(404)
+            return
+
+        body, etag, last_modified = self.feed.get()
+        # Last-Modified has one-second resolution. While the latest change is still in the
+        # current second another change could share its timestamp, so only the ETag is offered.
+        if int(time.time()) <= last_modified:
+            last_modified = None
+
+        if self._not_modified(etag, last_modified):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/calendar; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        if last_modified is not None:
+            self.send_header("Last-Modified", formatdate(last_modified, usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag: str, last_modified: Optional[int]) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            # Weak comparison (RFC 9110 8.8.3.2): the W/ prefix is ignored
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return etag in tags
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and last_modified is not None:
+            try:
+                return last_modified <= int(parsedate_to_datetime(if_modified_since).timestamp())
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        print(f"[feed] {self.address_string()} - {format % args}")
+
+
+def serve_feed(host=FEED_HOST, port=FEED_PORT):
+    """Runs the local .ics HTTP endpoint until interrupted."""
+    create_table()
+    server = ThreadingHTTPServer((host, port), FeedRequestHandler)
+    print(f"Serving calendar feed at http://{host}:{port}{FEED_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nFeed server stopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve_feed()
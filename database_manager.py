@@ -1,6 +1,6 @@
 import sqlite3
 from datetime import date
-from typing import List
+from typing import List, Set, Tuple
 from agent import Deadline # We import our data structure from agent.py
 
 # Define the database file name
@@ -20,12 +20,62 @@ def create_table():
             UNIQUE(task_name, course_name, due_date)
         );
         """)
+        # Per-row modification sequence and time, used by calendar_feed to re-render only changed rows
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(deadlines)")]
+        if "mod_seq" not in columns:
+            cursor.execute("ALTER TABLE deadlines ADD COLUMN mod_seq INTEGER NOT NULL DEFAULT 0")
+        if "updated_at" not in columns:
+            cursor.execute("ALTER TABLE deadlines ADD COLUMN updated_at INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("UPDATE deadlines SET updated_at = CAST(strftime('%s', 'now') AS INTEGER)")
+        cursor.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_deadlines_mod_seq ON deadlines (mod_seq);
+        -- Serve the chat filters compiled by query_parser
+        CREATE INDEX IF NOT EXISTS idx_deadlines_status_due ON deadlines (status, due_date);
+        CREATE INDEX IF NOT EXISTS idx_deadlines_status_course
+            ON deadlines (status, course_name COLLATE NOCASE);
+
+        CREATE TABLE IF NOT EXISTS sync_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            change_seq INTEGER NOT NULL,
+            modified_at INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO sync_state (id, change_seq, modified_at)
+        VALUES (1, 0, CAST(strftime('%s', 'now') AS INTEGER));
+
+        CREATE TRIGGER IF NOT EXISTS deadlines_track_insert AFTER INSERT ON deadlines
+        BEGIN
+            UPDATE sync_state SET change_seq = change_seq + 1,
+                modified_at = CAST(strftime('%s', 'now') AS INTEGER) WHERE id = 1;
+            UPDATE deadlines SET mod_seq = (SELECT change_seq FROM sync_state WHERE id = 1),
+                updated_at = (SELECT modified_at FROM sync_state WHERE id = 1)
+            WHERE id = NEW.id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS deadlines_track_update
+        AFTER UPDATE OF task_name, course_name, due_date, status ON deadlines
+        BEGIN
+            UPDATE sync_state SET change_seq = change_seq + 1,
+                modified_at = CAST(strftime('%s', 'now') AS INTEGER) WHERE id = 1;
+            UPDATE deadlines SET mod_seq = (SELECT change_seq FROM sync_state WHERE id = 1),
+                updated_at = (SELECT modified_at FROM sync_state WHERE id = 1)
+            WHERE id = NEW.id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS deadlines_track_delete AFTER DELETE ON deadlines
+        BEGIN
+            UPDATE sync_state SET change_seq = change_seq + 1,
+                modified_at = CAST(strftime('%s', 'now') AS INTEGER) WHERE id = 1;
+        END;
+        """)
         conn.commit()
         print("Database and table verified successfully.")
 
 
-def save_deadlines(deadline_list: List[Deadline]):
-    """Saves a list of Deadline objects to the SQLite database."""
+def save_deadlines(deadline_list: List[Deadline], strict: bool = False):
+    """
+    Saves a list of Deadline objects to the SQLite database.
+    With strict=True a database error is raised (and nothing is committed) instead of being printed.
+    """
     if not deadline_list:
         print("No new deadlines to save.")
         return
@@ -48,6 +98,8 @@ def save_deadlines(deadline_list: List[Deadline]):
                 else:
                     ignored_count += 1
             except sqlite3.Error as e:
+                if strict:
+                    raise
                 print(f"Error saving deadline {deadline.task_name}: {e}")
         
         conn.commit()
@@ -74,6 +126,31 @@ def cleanup_past_deadlines():
     except sqlite3.Error as e:
         print(f"Error during cleanup: {e}")
 
+def get_change_state() -> Tuple[int, int]:
+    """
+    Returns (change_seq, modified_at) for the whole table.
+    change_seq goes up on every insert, update or delete; modified_at is a Unix timestamp.
+    """
+    with sqlite3.connect(DB_FILE) as conn:
+        row = conn.execute("SELECT change_seq, modified_at FROM sync_state WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+def get_deadlines_changed_since(mod_seq: int) -> List[sqlite3.Row]:
+    """Returns every deadline inserted or edited after the given modification sequence."""
+    with sqlite3.connect(DB_FILE) as conn:
+        conn.row_factory = sqlite3.Row
+        return conn.execute(
+            "SELECT id, task_name, course_name, due_date, status, mod_seq, updated_at FROM deadlines WHERE mod_seq > ?",
+            (mod_seq,)
+        ).fetchall()
+
+
+def get_deadline_ids() -> Set[int]:
+    """Returns the ids of all stored deadlines (used to notice deleted rows)."""
+    with sqlite3.connect(DB_FILE) as conn:
+        return {row[0] for row in conn.execute("SELECT id FROM deadlines")}
+
 # --- This part is just for testing, you can ignore it ---
 if __name__ == "__main__":
     print("Initializing database...")
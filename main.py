@@ -38,6 +38,28 @@ def fetch_recent_emails(username, password, days=7) -> List[dict]:
         print(f"Error connecting or fetching email: {e}")
         return []
 
+def extract_from_email(email: dict) -> List[Deadline]:
+    """Runs the extractor agent on one email. Errors from the LLM call are raised to the caller."""
+    result = extractor_agent.invoke({"subject": email['subject'], "body": email['body']})
+    if result.deadlines:
+        print(f"  > Found {len(result.deadlines)} deadline(s).")
+        return list(result.deadlines)
+    print("  > No deadlines found.")
+    return []
+
+def process_emails(emails: List[dict]) -> List[Deadline]:
+    """Runs the extractor agent on each email and collects every deadline found."""
+    all_extracted_deadlines = []
+    
+    for i, email in enumerate(emails):
+        print(f"Processing email {i+1}/{len(emails)}: {email['subject'][:50]}...")
+        try:
+            all_extracted_deadlines.extend(extract_from_email(email))
+        except Exception as e:
+            print(f"  > Error processing email with AI: {e}")
+
+    return all_extracted_deadlines
+
 def run_agent():
     """The main end-to-end function for the agent's backend."""
     print("--- 🚀 Starting Email Deadline Agent ---")
@@ -69,19 +91,7 @@ def run_agent():
 
     # --- 5. Process with AI Agent (The "Brain") ---
     print(f"\n--- 🧠 Processing {len(emails_to_process)} emails with AI ---")
-    all_extracted_deadlines = []
-    
-    for i, email in enumerate(emails_to_process):
-        print(f"Processing email {i+1}/{len(emails_to_process)}: {email['subject'][:50]}...")
-        try:
-            result = extractor_agent.invoke({"subject": email['subject'], "body": email['body']})
-            if result.deadlines:
-                print(f"  > Found {len(result.deadlines)} deadline(s).")
-                all_extracted_deadlines.extend(result.deadlines)
-            else:
-                print("  > No deadlines found.")
-        except Exception as e:
-            print(f"  > Error processing email with AI: {e}")
+    all_extracted_deadlines = process_emails(emails_to_process)
 
     # --- 6. Save to Database (The "Memory") ---
     print("\n--- 💾 Saving results to database ---")
@@ -0,0 +1,185 @@
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Tuple
+
+# Columns returned when the caller does not ask for specific ones
+DEFAULT_COLUMNS = ("id", "task_name", "course_name", "due_date", "status")
+
+# Legacy chat keywords, kept so the old commands behave exactly as before
+KEYWORD_FILTERS = {
+    "quiz": ("(task_name LIKE ? OR course_name LIKE ?)", ["%quiz%", "%quiz%"]),
+    "assignment": ("(task_name LIKE ? OR task_name LIKE ?)", ["%assignment%", "%p-set%"]),
+}
+# Plain-text filters are matched by substring in this order, like the original chat box
+LEGACY_KEYWORDS = ("latest", "quiz", "assignment", "done")
+
+# Plural forms accepted for the category keywords in structured queries
+KEYWORD_ALIASES = {"quizzes": "quiz", "assignments": "assignment"}
+# Chat filler ignored in structured queries ("show me course:CS410", "what's due<7d")
+FILLER_WORDS = frozenset({
+    "show", "me", "my", "list", "find", "get", "give", "please", "what", "what's", "whats",
+    "which", "is", "are", "due", "the", "a", "an", "all", "for", "in", "of", "and", "with",
+    "that", "tasks", "task", "deadlines", "deadline", "items", "?",
+})
+
+STATUSES = ("pending", "done", "all")
+STRUCTURED_KEYS = ("course", "task", "status")
+DUE_PATTERN = re.compile(r"^due(<=|>=|<|>|=|:)(.+)$")
+RELATIVE_PATTERN = re.compile(r"^(-?\d+)([dw])$")
+# Whitespace-separated terms; double quotes group words (apostrophes are left alone)
+TERM_PATTERN = re.compile(r'(?:[^\s"]+|"[^"]*")+')
+
+
+def _like_escape(value: str) -> str:
+    """Escapes LIKE wildcards so user text is matched literally (used with ESCAPE '\\')."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _resolve_date(value: str, today: date) -> date:
+    """Turns 'today', 'tomorrow', '7d', '2w' or an ISO date into a date."""
+    if value == "today":
+        return today
+    if value == "tomorrow":
+        return today + timedelta(days=1)
+    match = RELATIVE_PATTERN.match(value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        return today + timedelta(days=amount * (7 if unit == "w" else 1))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Unrecognised date '{value}'. Use today, tomorrow, 7d, 2w or YYYY-MM-DD.")
+
+
+def _terms(query: str) -> List[str]:
+    return [t.replace('"', "") for t in TERM_PATTERN.findall(query)]
+
+
+def _is_structured_term(term: str) -> bool:
+    key, sep, _ = term.partition(":")
+    return bool(sep and key.lower() in STRUCTURED_KEYS) or bool(DUE_PATTERN.match(term.lower()))
+
+
+def has_structured_terms(query: str) -> bool:
+    """True when the query uses at least one key:value or due term."""
+    return any(_is_structured_term(term) for term in _terms(query))
+
+
+def is_recognised_filter(query: str) -> bool:
+    """True when compile_query will apply a real filter rather than the default pending list."""
+    if has_structured_terms(query):
+        return True
+    lowered = query.lower()
+    return any(keyword in lowered for keyword in LEGACY_KEYWORDS)
+
+
+def compile_query(query: str, columns: Tuple[str, ...] = DEFAULT_COLUMNS) -> Tuple[str, List]:
+    """
+    Compiles a chat filter into a parameterized SELECT on the deadlines table.
+
+    Plain text (no key:value or due term) keeps the original chat behaviour:
+    the first of latest / quiz / assignment / done found anywhere in it picks
+    the filter, and anything else lists all pending tasks.
+
+    Structured queries support these terms (all ANDed together):
+        course:CS410      course name starts with CS410
+        task:"Homework 3" task name contains the text
+        status:done       pending (default), done or all
+        due<7d            also <=, >, >=, = and due:; values are today, tomorrow, Nd, Nw or YYYY-MM-DD
+        quiz, assignment  the legacy category filters (plurals accepted)
+        latest            no-op, kept for the old command
+    Common filler words ("show me", "what's", ...) are ignored; any other bare
+    word is rejected, since free text belongs in task:"...".
+
+    Returns (sql, params). Raises ValueError for malformed terms or unknown words.
+    """
+    # Relative dates depend on today, so it is part of the cache key
+    sql, params = _compile(" ".join(query.split()), tuple(columns), date.today(), False)
+    return sql, list(params)
+
+
+def compile_task_search(search_term: str, columns: Tuple[str, ...] = DEFAULT_COLUMNS) -> Tuple[str, List]:
+    """
+    Compiles the delete search. Plain text is matched as one phrase against
+    pending task names; structured searches go through compile_query's grammar.
+    """
+    sql, params = _compile(search_term.strip(), tuple(columns), date.today(), True)
+    return sql, list(params)
+
+
+@lru_cache(maxsize=128)
+def _compile(query: str, columns: Tuple[str, ...], today: date, phrase_search: bool) -> Tuple[str, Tuple]:
+    terms = _terms(query)
+    select = f"SELECT {', '.join(columns)} FROM deadlines"
+
+    if not any(_is_structured_term(term) for term in terms):
+        if phrase_search:
+            return (f"{select} WHERE status = ? AND task_name LIKE ? ESCAPE '\\' ORDER BY due_date ASC",
+                    ("pending", f"%{_like_escape(query)}%"))
+        return _compile_legacy(query.lower(), select)
+
+    status = "pending"
+    clauses = []
+    params = []
+    unknown = []
+
+    for term in terms:
+        # Trailing punctuation from chat phrasing ("due<7d?") is not part of the term
+        term = term.rstrip(",.!?") or term
+        lowered = KEYWORD_ALIASES.get(term.lower(), term.lower())
+        key, sep, value = term.partition(":")
+        key = key.lower()
+
+        if lowered == "latest" or lowered in FILLER_WORDS:
+            continue
+        if lowered == "done":
+            status = "done"
+        elif lowered in KEYWORD_FILTERS:
+            clause, clause_params = KEYWORD_FILTERS[lowered]
+            clauses.append(clause)
+            params.extend(clause_params)
+        elif DUE_PATTERN.match(lowered):
+            op, raw_value = DUE_PATTERN.match(lowered).groups()
+            op = "=" if op == ":" else op
+            clauses.append(f"due_date {op} ?")
+            params.append(_resolve_date(raw_value, today).isoformat())
+        elif sep and key == "status":
+            if value.lower() not in STATUSES:
+                raise ValueError(f"Unknown status '{value}'. Use one of: {', '.join(STATUSES)}.")
+            status = value.lower()
+        elif sep and key == "course":
+            # Prefix match so SQLite can use the (status, course_name NOCASE) index
+            clauses.append("course_name LIKE ? ESCAPE '\\'")
+            params.append(f"{_like_escape(value)}%")
+        elif sep and key == "task":
+            clauses.append("task_name LIKE ? ESCAPE '\\'")
+            params.append(f"%{_like_escape(value)}%")
+        else:
+            unknown.append(term)
+
+    if unknown:
+        words = ", ".join(f"'{word}'" for word in unknown)
+        raise ValueError(f"Unrecognised word(s) {words}. To search task names use task:\"...\".")
+
+    if status != "all":
+        clauses.insert(0, "status = ?")
+        params.insert(0, status)
+
+    sql = select
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY due_date DESC" if status == "done" else " ORDER BY due_date ASC"
+    return sql, tuple(params)
+
+
+def _compile_legacy(query: str, select: str) -> Tuple[str, Tuple]:
+    """The original substring-based chat filters."""
+    if "latest" in query:
+        return f"{select} WHERE status = ? ORDER BY due_date ASC", ("pending",)
+    for keyword, (clause, clause_params) in KEYWORD_FILTERS.items():
+        if keyword in query:
+            return f"{select} WHERE status = ? AND {clause} ORDER BY due_date ASC", ("pending", *clause_params)
+    if "done" in query:
+        return f"{select} WHERE status = ? ORDER BY due_date DESC", ("done",)
+    return f"{select} WHERE status = ? ORDER BY due_date ASC", ("pending",)
@@ -0,0 +1,45 @@
+import os
+import sys
+import types
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# agent.py builds a Gemini client at import time, so tests use a stand-in
+# extractor that reads "task|course|YYYY-MM-DD" lines from the email body.
+@dataclass
+class Deadline:
+    task_name: str
+    due_date: date
+    course_name: Optional[str] = None
+
+
+@dataclass
+class DeadlinesFound:
+    deadlines: List[Deadline]
+
+
+class FakeExtractor:
+
+    def __init__(self):
+        self.before_invoke = None  # optional hook(subject), may raise or block
+
+    def invoke(self, inputs):
+        if self.before_invoke:
+            self.before_invoke(inputs["subject"])
+        found = []
+        for line in inputs["body"].splitlines():
+            parts = line.strip().split("|")
+            if len(parts) == 3:
+                found.append(Deadline(parts[0], date.fromisoformat(parts[2]), parts[1] or None))
+        return DeadlinesFound(found)
+
+
+fake_agent = types.ModuleType("agent")
+fake_agent.Deadline = Deadline
+fake_agent.DeadlinesFound = DeadlinesFound
+fake_agent.extractor_agent = FakeExtractor()
+sys.modules.setdefault("agent", fake_agent)
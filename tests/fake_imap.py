@@ -0,0 +1,194 @@
+"""
+A minimal in-process IMAP server for exercising watcher.py.
+
+It speaks just enough IMAP4rev1 for imap_tools: CAPABILITY, LOGIN, SELECT,
+STATUS, UID SEARCH (UID n:*), UID FETCH, NOOP, IDLE and LOGOUT on a single
+INBOX. Like a real server, EXISTS is pushed straight away to clients in IDLE
+and otherwise queued until the client's next command.
+"""
+import re
+import socket
+import socketserver
+import threading
+from email.message import EmailMessage
+
+
+class FakeImapServer:
+
+    def __init__(self, capabilities=("IMAP4rev1", "IDLE"), uid_validity=1):
+        self.capabilities = capabilities
+        self.uid_validity = uid_validity
+        self.messages = []  # (uid, raw bytes)
+        self.next_uid = 1
+        self.logins = 0
+        self.lock = threading.Lock()
+        self._sessions = []
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                session = _Session(server, self.connection, self.rfile)
+                with server.lock:
+                    server._sessions.append(session)
+                try:
+                    session.run()
+                except (OSError, ValueError):
+                    pass
+                finally:
+                    with server.lock:
+                        if session in server._sessions:
+                            server._sessions.remove(session)
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.drop_connections()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def deliver(self, subject, body):
+        """Adds a message to INBOX and announces it to every connected client."""
+        msg = EmailMessage()
+        msg["Subject"] = subject
+        msg["From"] = "prof@example.com"
+        msg["To"] = "student@example.com"
+        msg.set_content(body)
+        with self.lock:
+            self.messages.append((self.next_uid, msg.as_bytes()))
+            self.next_uid += 1
+            count = len(self.messages)
+            for session in self._sessions:
+                session.announce(count)
+
+    def drop_connections(self):
+        """Closes every client socket, as a network failure would."""
+        with self.lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def idling_sessions(self):
+        with self.lock:
+            return sum(1 for s in self._sessions if s.idling)
+
+
+class _Session:
+
+    def __init__(self, server, conn, rfile):
+        self.server = server
+        self.conn = conn
+        self.rfile = rfile
+        self.idling = False
+        self.pending_exists = None
+        self.send_lock = threading.Lock()
+
+    def send(self, data: bytes):
+        with self.send_lock:
+            self.conn.sendall(data)
+
+    def close(self):
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.conn.close()
+
+    def announce(self, count):
+        # Called with server.lock held
+        if self.idling:
+            self.send(f"* {count} EXISTS\r\n".encode())
+        else:
+            self.pending_exists = count
+
+    def flush_pending(self):
+        with self.server.lock:
+            count, self.pending_exists = self.pending_exists, None
+        if count is not None:
+            self.send(f"* {count} EXISTS\r\n".encode())
+
+    def run(self):
+        self.send(b"* OK Fake IMAP ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, _, rest = line.decode().rstrip("\r\n").partition(" ")
+            command, _, args = rest.partition(" ")
+            command = command.upper()
+            if command == "UID":
+                command, _, args = args.partition(" ")
+                command = "UID " + command.upper()
+
+            self.flush_pending()
+            handler = getattr(self, "cmd_" + command.replace(" ", "_"), None)
+            if handler is None:
+                self.send(f"{tag} BAD unknown command\r\n".encode())
+                continue
+            if handler(tag, args) == "logout":
+                return
+
+    def cmd_CAPABILITY(self, tag, args):
+        self.send(f"* CAPABILITY {' '.join(self.server.capabilities)}\r\n{tag} OK done\r\n".encode())
+
+    def cmd_LOGIN(self, tag, args):
+        with self.server.lock:
+            self.server.logins += 1
+        self.send(f"{tag} OK logged in\r\n".encode())
+
+    def cmd_SELECT(self, tag, args):
+        with self.server.lock:
+            count, uid_next = len(self.server.messages), self.server.next_uid
+        self.send((f"* {count} EXISTS\r\n* OK [UIDVALIDITY {self.server.uid_validity}] ok\r\n"
+                   f"* OK [UIDNEXT {uid_next}] ok\r\n{tag} OK [READ-WRITE] selected\r\n").encode())
+
+    def cmd_STATUS(self, tag, args):
+        with self.server.lock:
+            count, uid_next = len(self.server.messages), self.server.next_uid
+        self.send((f'* STATUS "INBOX" (MESSAGES {count} UIDNEXT {uid_next} '
+                   f"UIDVALIDITY {self.server.uid_validity})\r\n{tag} OK status\r\n").encode())
+
+    def cmd_NOOP(self, tag, args):
+        self.send(f"{tag} OK noop\r\n".encode())
+
+    def cmd_UID_SEARCH(self, tag, args):
+        start = int(re.search(r"UID (\d+):\*", args).group(1))
+        with self.server.lock:
+            uids = [uid for uid, _ in self.server.messages]
+        matched = [u for u in uids if u >= start] or uids[-1:]  # "n:*" always includes the newest
+        self.send(f"* SEARCH {' '.join(map(str, matched))}\r\n{tag} OK search\r\n".encode())
+
+    def cmd_UID_FETCH(self, tag, args):
+        wanted = {int(u) for u in args.split(" ", 1)[0].split(",")}
+        with self.server.lock:
+            messages = list(self.server.messages)
+        out = b""
+        for seq, (uid, raw) in enumerate(messages, start=1):
+            if uid in wanted:
+                out += (f"* {seq} FETCH (UID {uid} FLAGS () RFC822.SIZE {len(raw)} "
+                        f"BODY[] {{{len(raw)}}}\r\n").encode() + raw + b")\r\n"
+        self.send(out + f"{tag} OK fetch\r\n".encode())
+
+    def cmd_IDLE(self, tag, args):
+        if "IDLE" not in self.server.capabilities:
+            self.send(f"{tag} BAD IDLE not supported\r\n".encode())
+            return
+        with self.server.lock:
+            self.idling = True
+            self.send(b"+ idling\r\n")
+        try:
+            self.rfile.readline()  # DONE
+        finally:
+            with self.server.lock:
+                self.idling = False
+        self.send(f"{tag} OK IDLE terminated\r\n".encode())
+
+    def cmd_LOGOUT(self, tag, args):
+        self.send(f"* BYE bye\r\n{tag} OK logout\r\n".encode())
+        return "logout"
@@ -0,0 +1,105 @@
+import sqlite3
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import calendar_feed
+import database_manager
+
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_FILE", str(tmp_path / "deadlines.db"))
+    database_manager.create_table()
+
+
+def add_deadline(task_name, due_date="2030-01-10", course_name="CS410"):
+    with sqlite3.connect(database_manager.DB_FILE) as conn:
+        conn.execute("INSERT INTO deadlines (task_name, course_name, due_date) VALUES (?, ?, ?)",
+                     (task_name, course_name, due_date))
+
+
+@pytest.fixture
+def feed_url(monkeypatch):
+    monkeypatch.setattr(calendar_feed.FeedRequestHandler, "feed", calendar_feed.CalendarFeed())
+    server = ThreadingHTTPServer(("127.0.0.1", 0), calendar_feed.FeedRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}{calendar_feed.FEED_PATH}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url, headers=None):
+    try:
+        response = urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}))
+        return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def test_conditional_requests(feed_url, monkeypatch):
+    add_deadline("Homework 1")
+    _, modified_at = database_manager.get_change_state()
+    monkeypatch.setattr(calendar_feed.time, "time", lambda: modified_at + 10)
+
+    status, headers, body = get(feed_url)
+    assert status == 200 and b"SUMMARY:Homework 1 (CS410)" in body
+
+    assert get(feed_url, {"If-None-Match": headers["ETag"]})[0] == 304
+    assert get(feed_url, {"If-None-Match": "W/" + headers["ETag"]})[0] == 304
+    assert get(feed_url, {"If-Modified-Since": headers["Last-Modified"]})[0] == 304
+    assert get(feed_url, {"If-None-Match": '"stale"'})[0] == 200
+
+
+def test_last_modified_withheld_during_change_second(feed_url, monkeypatch):
+    add_deadline("Homework 1")
+    _, modified_at = database_manager.get_change_state()
+    monkeypatch.setattr(calendar_feed.time, "time", lambda: modified_at + 0.5)
+
+    status, headers, _ = get(feed_url)
+    assert status == 200 and "Last-Modified" not in headers
+    assert get(feed_url, {"If-Modified-Since": "Tue, 01 Jan 2100 00:00:00 GMT"})[0] == 200
+    assert get(feed_url, {"If-None-Match": headers["ETag"]})[0] == 304
+
+
+def test_render_is_stable_across_restarts():
+    add_deadline("Homework 1")
+    running = calendar_feed.CalendarFeed()
+    running.get()
+
+    add_deadline("Quiz 2", course_name=None)
+    with sqlite3.connect(database_manager.DB_FILE) as conn:
+        # Pretend the second change happened a while after the first one
+        conn.execute("UPDATE sync_state SET modified_at = modified_at + 100")
+
+    assert running.get() == calendar_feed.CalendarFeed().get()
+
+
+def test_only_changed_rows_are_rerendered(monkeypatch):
+    add_deadline("Homework 1")
+    add_deadline("Homework 2")
+    feed = calendar_feed.CalendarFeed()
+    feed.get()
+
+    rendered = []
+    original = calendar_feed.render_vevent
+    monkeypatch.setattr(calendar_feed, "render_vevent", lambda row: rendered.append(row["task_name"]) or original(row))
+    with sqlite3.connect(database_manager.DB_FILE) as conn:
+        conn.execute("UPDATE deadlines SET status = 'done' WHERE task_name = 'Homework 2'")
+        conn.execute("DELETE FROM deadlines WHERE task_name = 'Homework 1'")
+
+    body = feed.get()[0]
+    assert rendered == ["Homework 2"]
+    assert b"[Done] Homework 2" in body and b"Homework 1" not in body
+
+
+def test_line_breaks_in_task_names_are_escaped():
+    add_deadline("Lab\r\nreport\rdraft")
+
+    body = calendar_feed.CalendarFeed().get()[0]
+
+    assert b"SUMMARY:Lab\\nreport\\ndraft (CS410)\r\n" in body
+    assert b"\r" not in body.replace(b"\r\n", b"")
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+import database_manager
+from query_parser import compile_query, compile_task_search, is_recognised_filter
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_FILE", str(tmp_path / "deadlines.db"))
+    database_manager.create_table()
+    conn = sqlite3.connect(database_manager.DB_FILE)
+    conn.executemany(
+        "INSERT INTO deadlines (task_name, course_name, due_date, status) VALUES (?, ?, date('now', ?), ?)",
+        [
+            ("Homework 3", "CS410", "+3 days", "pending"),
+            ("Homework 13", "CS410", "+20 days", "pending"),
+            ("Quiz 1", "MTH101", "+2 days", "pending"),
+            ("Quiz 10", "MTH101", "+9 days", "pending"),
+            ("Read latest paper", "PHY102", "+5 days", "pending"),
+            ("Assignment 2", "CS410", "+1 days", "done"),
+        ],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def tasks(conn, compiled):
+    sql, params = compiled
+    return [row[0] for row in conn.execute(sql.replace("SELECT id, task_name", "SELECT task_name"), params)]
+
+
+def test_plain_text_keeps_legacy_keyword_filters(conn):
+    assert len(tasks(conn, compile_query("show me latest quizzes"))) == 5
+    assert tasks(conn, compile_query("quiz")) == ["Quiz 1", "Quiz 10"]
+    assert tasks(conn, compile_query("done")) == ["Assignment 2"]
+    assert not is_recognised_filter("hello there")
+
+
+def test_delete_search_matches_plain_text_as_one_phrase(conn):
+    assert tasks(conn, compile_task_search("Homework 3")) == ["Homework 3"]
+    assert tasks(conn, compile_task_search("latest")) == ["Read latest paper"]
+
+
+def test_structured_terms_are_combined(conn):
+    assert tasks(conn, compile_query("course:cs410 due<7d")) == ["Homework 3"]
+    assert tasks(conn, compile_query("course:MTH quizzes due<=9d")) == ["Quiz 1", "Quiz 10"]
+    assert tasks(conn, compile_query('status:all task:"Assignment"')) == ["Assignment 2"]
+
+
+def test_structured_queries_ignore_chat_filler(conn):
+    assert tasks(conn, compile_query("show me course:CS410")) == ["Homework 3", "Homework 13"]
+    assert tasks(conn, compile_query("what's due<7d?")) == ["Quiz 1", "Homework 3", "Read latest paper"]
+
+
+def test_unknown_words_in_structured_queries_are_rejected():
+    with pytest.raises(ValueError, match="'homework'"):
+        compile_query("course:CS410 homework")
+    with pytest.raises(ValueError, match="Unknown status"):
+        compile_query("status:later")
+    with pytest.raises(ValueError, match="Unrecognised date"):
+        compile_query("due<soon")
+
+
+def test_course_filter_uses_status_course_index(conn):
+    sql, params = compile_query("course:CS410")
+    plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    assert "idx_deadlines_status_course" in plan[0][3]
@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import database_manager
+import watcher
+from conftest import fake_agent
+from fake_imap import FakeImapServer
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def saved_tasks():
+    with sqlite3.connect(database_manager.DB_FILE) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT task_name FROM deadlines"))
+
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_FILE", str(tmp_path / "deadlines.db"))
+    database_manager.create_table()
+    # Long enough that a test only passes if mail is found without waiting out an IDLE round
+    monkeypatch.setattr(watcher, "IDLE_TIMEOUT", 30)
+    monkeypatch.setattr(watcher, "RECONNECT_DELAY", 0.5)
+    monkeypatch.setattr(watcher, "POLL_INTERVAL", 0.2)
+    monkeypatch.setattr(fake_agent.extractor_agent, "before_invoke", None)
+
+
+@pytest.fixture
+def start_watcher():
+    started = []
+
+    def start(server):
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=watcher.watch_inbox,
+            args=("student", "secret"),
+            kwargs={"host": "127.0.0.1", "port": server.port, "use_ssl": False, "stop_event": stop},
+            daemon=True,
+        )
+        thread.start()
+        started.append((server, stop, thread))
+        return stop
+
+    yield start
+
+    for server, stop, thread in started:
+        stop.set()
+        server.drop_connections()
+        thread.join(timeout=5)
+        server.stop()
+
+
+def test_idle_exists_saves_only_new_mail(start_watcher):
+    server = FakeImapServer().start()
+    server.deliver("Old news", "Old Task|CS101|2030-01-01")
+    start_watcher(server)
+    assert wait_until(lambda: server.idling_sessions() == 1)
+
+    server.deliver("HW 1 released", "Homework 1|CS410|2030-01-10")
+
+    assert wait_until(lambda: saved_tasks() == ["Homework 1"])
+
+
+def test_mail_arriving_during_extraction_is_not_missed(start_watcher):
+    server = FakeImapServer().start()
+    release = threading.Event()
+    in_extraction = threading.Event()
+
+    def slow_first_email(subject):
+        if subject == "first":
+            in_extraction.set()
+            release.wait(5)
+
+    fake_agent.extractor_agent.before_invoke = slow_first_email
+    start_watcher(server)
+    assert wait_until(lambda: server.idling_sessions() == 1)
+
+    server.deliver("first", "Task A|CS410|2030-01-10")
+    assert in_extraction.wait(5)
+    # Announced while the watcher is busy, so the EXISTS arrives outside IDLE
+    server.deliver("second", "Task B|CS410|2030-01-11")
+    release.set()
+
+    assert wait_until(lambda: saved_tasks() == ["Task A", "Task B"])
+
+
+def test_reconnect_catches_up_on_missed_mail(start_watcher):
+    server = FakeImapServer().start()
+    start_watcher(server)
+    assert wait_until(lambda: server.idling_sessions() == 1)
+
+    server.drop_connections()
+    server.deliver("While offline", "Lab Report|PHY102|2030-02-01")
+
+    assert wait_until(lambda: saved_tasks() == ["Lab Report"])
+    assert server.logins == 2
+
+
+def test_uidvalidity_change_starts_from_current_end(start_watcher):
+    server = FakeImapServer().start()
+    start_watcher(server)
+    assert wait_until(lambda: server.idling_sessions() == 1)
+
+    server.uid_validity = 2
+    server.drop_connections()
+    server.deliver("Renumbered mailbox", "Stale|CS101|2030-01-01")
+    assert wait_until(lambda: server.logins == 2 and server.idling_sessions() == 1)
+
+    server.deliver("After reset", "Fresh|CS101|2030-01-02")
+
+    assert wait_until(lambda: saved_tasks() == ["Fresh"])
+
+
+def test_server_without_idle_is_polled_without_relogin(start_watcher):
+    server = FakeImapServer(capabilities=("IMAP4rev1",)).start()
+    start_watcher(server)
+    assert wait_until(lambda: server.logins == 1)
+    time.sleep(0.3)
+
+    server.deliver("Quiz", "Quiz 2|MTH101|2030-03-01")
+
+    assert wait_until(lambda: saved_tasks() == ["Quiz 2"])
+    assert server.logins == 1
+
+
+def test_failed_extraction_is_retried(start_watcher, monkeypatch):
+    monkeypatch.setattr(watcher, "IDLE_TIMEOUT", 0.2)
+    server = FakeImapServer().start()
+    attempts = []
+
+    def flaky(subject):
+        attempts.append(subject)
+        if len(attempts) == 1:
+            raise RuntimeError("LLM unavailable")
+
+    fake_agent.extractor_agent.before_invoke = flaky
+    start_watcher(server)
+    assert wait_until(lambda: server.idling_sessions() == 1)
+
+    server.deliver("Project", "Project Proposal|CS300|2030-04-01")
+
+    assert wait_until(lambda: saved_tasks() == ["Project Proposal"])
+    assert len(attempts) == 2
+
+
+def test_database_error_is_retried(start_watcher, monkeypatch):
+    monkeypatch.setattr(watcher, "IDLE_TIMEOUT", 0.2)
+    server = FakeImapServer().start()
+    real_save = watcher.save_deadlines
+    calls = []
+
+    def locked_once(deadlines, strict=False):
+        calls.append(strict)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        real_save(deadlines, strict=strict)
+
+    monkeypatch.setattr(watcher, "save_deadlines", locked_once)
+    start_watcher(server)
+    assert wait_until(lambda: server.idling_sessions() == 1)
+
+    server.deliver("Essay", "Essay Draft|HSS101|2030-05-01")
+
+    assert wait_until(lambda: saved_tasks() == ["Essay Draft"])
+    assert calls == [True, True]
@@ -0,0 +1,207 @@
+import os
+import time
+import imaplib
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+from imap_tools import MailBox, MailBoxUnencrypted, A, U
+from imap_tools.errors import ImapToolsError
+
+from main import IMAP_SERVER, IMAP_PORT, extract_from_email
+from database_manager import create_table, save_deadlines, cleanup_past_deadlines
+
+load_dotenv()
+
+# Seconds to stay in one IDLE round before re-issuing it (RFC 2177 asks for < 29 min)
+IDLE_TIMEOUT = 60
+# Seconds between NOOPs, used to detect half-open connections between IDLE rounds
+KEEPALIVE_INTERVAL = 5 * 60
+# Seconds between NOOP polls when the server does not advertise IDLE
+POLL_INTERVAL = 30
+# Extraction attempts per message before an email that keeps failing is skipped
+MAX_ATTEMPTS = 3
+# Reconnect backoff bounds in seconds
+RECONNECT_DELAY = 5
+MAX_RECONNECT_DELAY = 5 * 60
+
+# Errors that mean the connection is gone and we should log in again
+CONNECTION_ERRORS = (imaplib.IMAP4.error, ImapToolsError, OSError)
+
+
+def connect(username, password, host=IMAP_SERVER, port=IMAP_PORT, use_ssl=True):
+    """Opens a logged-in mailbox on INBOX. Set use_ssl=False for a local test server."""
+    mailbox_cls = MailBox if use_ssl else MailBoxUnencrypted
+    return mailbox_cls(host, port=port).login(username, password, initial_folder="INBOX")
+
+
+def fetch_new_emails(mailbox, last_uid: int) -> List[dict]:
+    """
+    Fetches every INBOX message with a UID above last_uid, oldest first.
+    Each email has the same keys as fetch_recent_emails plus its "uid".
+    Messages are left unread so the manual scan still sees them.
+    """
+    fetched_emails = []
+    criteria = A(uid=U(str(last_uid + 1), "*"))
+
+    for msg in mailbox.fetch(criteria, mark_seen=False, bulk=True):
+        uid = int(msg.uid)
+        # "n:*" always matches the newest message, even when its UID is below n
+        if uid <= last_uid:
+            continue
+        fetched_emails.append({"uid": uid, "subject": msg.subject, "body": msg.text})
+
+    return sorted(fetched_emails, key=lambda email: email["uid"])
+
+
+def handle_new_emails(mailbox, last_uid: int, failures: Dict[int, int]) -> int:
+    """
+    Extracts and saves deadlines from messages newer than last_uid, one message at a time,
+    and keeps fetching until no newer mail is left (mail can arrive while the LLM runs).
+    Returns the UID of the last message that was fully processed and saved.
+    On an LLM or database error it stops there, so that message and the ones
+    after it are retried on the next round. Database errors are retried until
+    they clear; failures counts extraction attempts per UID, and after
+    MAX_ATTEMPTS a message is skipped so one bad email cannot block the rest.
+    """
+    while True:
+        emails = fetch_new_emails(mailbox, last_uid)
+        if not emails:
+            return last_uid
+        print(f"\n--- 📬 {len(emails)} new email(s) to process ---")
+
+        for email in emails:
+            if email["body"]:
+                print(f"Processing email UID {email['uid']}: {(email['subject'] or '')[:50]}...")
+                try:
+                    deadlines = extract_from_email(email)
+                    save_deadlines(deadlines, strict=True)
+                except sqlite3.Error as e:
+                    print(f"  > Database error while saving: {e}. Will retry.")
+                    return last_uid
+                except Exception as e:
+                    failures[email["uid"]] = failures.get(email["uid"], 0) + 1
+                    if failures[email["uid"]] < MAX_ATTEMPTS:
+                        print(f"  > Error processing email (attempt {failures[email['uid']]}/{MAX_ATTEMPTS}): {e}. Will retry.")
+                        return last_uid
+                    print(f"  > Giving up on email UID {email['uid']} after {MAX_ATTEMPTS} attempts: {e}")
+            failures.pop(email["uid"], None)
+            last_uid = email["uid"]
+
+
+def wait_for_mail(mailbox, timeout: float):
+    """
+    One IDLE round. An EXISTS sent just before the server acknowledged IDLE is
+    read by imaplib into untagged_responses rather than returned by poll(),
+    so that case ends the round immediately instead of waiting for the timeout.
+    """
+    mailbox.client.untagged_responses.pop("EXISTS", None)
+    mailbox.idle.start()
+    try:
+        if not mailbox.client.untagged_responses.pop("EXISTS", None):
+            mailbox.idle.poll(timeout=timeout)
+    finally:
+        mailbox.idle.stop()
+
+
+def watch_inbox(username, password, host=IMAP_SERVER, port=IMAP_PORT, use_ssl=True,
+                stop_event: Optional[threading.Event] = None):
+    """
+    Keeps one IMAP connection open and waits in IDLE for new mail.
+    Each new message is run through the extractor agent as soon as the server
+    announces it, so there is no re-login and only a narrow UID-range search per check.
+    Servers without IDLE are polled with NOOP on the same connection instead.
+    After every IDLE round (or poll) the mailbox is checked for UIDs above the
+    last one processed, so mail announced while we were busy extracting is
+    not missed, and messages that failed to process or save are retried.
+    Reconnects with exponential backoff when the connection drops; mail that
+    arrived while disconnected is picked up on the next login.
+    Runs until stop_event is set (or forever when it is None).
+    """
+    stop_event = stop_event or threading.Event()
+    last_uid = None
+    uid_validity = None
+    failures: Dict[int, int] = {}
+    delay = RECONNECT_DELAY
+
+    while not stop_event.is_set():
+        mailbox = None
+        try:
+            print(f"Connecting to {host}:{port} for IDLE watch...")
+            mailbox = connect(username, password, host=host, port=port, use_ssl=use_ssl)
+            status = mailbox.folder.status("INBOX", ["UIDNEXT", "UIDVALIDITY"])
+            supports_idle = "IDLE" in mailbox.client.capabilities
+            if supports_idle:
+                print("Login successful. Waiting for new mail...")
+            else:
+                print(f"Login successful. Server does not support IDLE; polling every {POLL_INTERVAL}s instead.")
+
+            # A new UIDVALIDITY means old UIDs are meaningless, so start from the current end
+            if last_uid is None or status["UIDVALIDITY"] != uid_validity:
+                uid_validity = status["UIDVALIDITY"]
+                last_uid = status["UIDNEXT"] - 1
+                failures.clear()
+            else:
+                # Catch up on anything that arrived while we were disconnected
+                last_uid = handle_new_emails(mailbox, last_uid, failures)
+
+            delay = RECONNECT_DELAY
+            last_noop = time.monotonic()
+
+            while not stop_event.is_set():
+                if supports_idle:
+                    # The UID check below runs after every round, not only when IDLE
+                    # reports EXISTS, so no announcement can be lost between rounds
+                    wait_for_mail(mailbox, IDLE_TIMEOUT)
+                else:
+                    if stop_event.wait(POLL_INTERVAL):
+                        break
+                    mailbox.client.noop()
+                    last_noop = time.monotonic()
+                last_uid = handle_new_emails(mailbox, last_uid, failures)
+
+                if time.monotonic() - last_noop >= KEEPALIVE_INTERVAL:
+                    mailbox.client.noop()
+                    last_noop = time.monotonic()
+
+        except CONNECTION_ERRORS as e:
+            print(f"IMAP connection lost: {e}. Reconnecting in {delay}s...")
+            stop_event.wait(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+        finally:
+            if mailbox:
+                try:
+                    mailbox.logout()
+                except Exception:
+                    pass
+
+    print("IDLE watch stopped.")
+
+
+def run_watcher():
+    """Daemon entry point: prepares the database and watches the inbox until interrupted."""
+    print("--- 👀 Starting Email Deadline Watcher ---")
+    create_table()
+    cleanup_past_deadlines()
+
+    user_login = os.environ.get("EMAIL_USER")
+    pwd = os.environ.get("EMAIL_PASS")
+
+    if not user_login or not pwd:
+        print("Error: EMAIL_USER or EMAIL_PASS not set in .env file.")
+        return
+
+    # IMAP_* overrides let the watcher run against a local IMAP stand-in
+    host = os.environ.get("IMAP_SERVER", IMAP_SERVER)
+    port = int(os.environ.get("IMAP_PORT", IMAP_PORT))
+    use_ssl = os.environ.get("IMAP_SSL", "true").lower() not in ("0", "false", "no")
+
+    try:
+        watch_inbox(user_login, pwd, host=host, port=port, use_ssl=use_ssl)
+    except KeyboardInterrupt:
+        print("\nWatcher interrupted. Exiting.")
+
+
+if __name__ == "__main__":
+    run_watcher()